@@ -114,8 +114,8 @@ class HarmonyWorker(QThread):
         self.state_manager = state_manager
         
         # Device command throttling state
-        self._last_device_command_time = 0.0
-        self._device_command_min_interval = 0.05  # 50ms minimum between device commands
+        self._last_device_command_ns = 0  # time.monotonic_ns() of last device command
+        self._device_command_min_interval_ns = 50_000_000  # 50ms minimum between device commands
 
     def run(self):
         """Esegue il loop asyncio in un thread separato"""
@@ -221,13 +221,13 @@ class HarmonyWorker(QThread):
             if self.state_manager:
                 command_type = self.state_manager.classify_command(cmd, action)
                 if command_type.value in ['device', 'audio']:  # Device and audio commands need throttling
-                    current_time = time.time()
-                    time_since_last = current_time - self._last_device_command_time
-                    if time_since_last < self._device_command_min_interval:
+                    # Monotonic clock: immune to wall-clock adjustments (NTP, DST)
+                    ns_since_last = time.monotonic_ns() - self._last_device_command_ns
+                    if ns_since_last < self._device_command_min_interval_ns:
                         # Wait for the remaining time to maintain minimum interval
-                        sleep_time = self._device_command_min_interval - time_since_last
-                        await asyncio.sleep(sleep_time)
-                    self._last_device_command_time = time.time()
+                        sleep_ns = self._device_command_min_interval_ns - ns_since_last
+                        await asyncio.sleep(sleep_ns / 1e9)
+                    self._last_device_command_ns = time.monotonic_ns()
             
             # 0. SMART COMMANDS (Routing dinamico basato sull'attività)
             if cmd.startswith("smart_"):
@@ -4,13 +4,20 @@ StateManager - Centralized state management for Harmony Hub Controller
 Handles state coordination between GUI and Worker components
 """
 
+import logging
+import re
 import time
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from enum import Enum
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Deque
 from PyQt6.QtCore import QObject, pyqtSignal
 from device_helpers import TV_ACTIONS, TV_KEYWORDS, is_tv_device, is_tv_action
 
+logger = logging.getLogger(__name__)
+
 
 class CommandType(Enum):
     """Classification of command types for different handling strategies"""
@@ -39,6 +46,77 @@ class UIState:
     last_update: float
 
 
+# Error message keywords used by handle_command_error to classify failures
+_NETWORK_ERROR_RE = re.compile(r"network|connection|connect|websocket", re.IGNORECASE)
+_TIMEOUT_ERROR_RE = re.compile(r"timeout|timed out|time out", re.IGNORECASE)
+_TV_CONFIG_ERROR_RE = re.compile(r"not configured|not found|validation failed", re.IGNORECASE)
+
+# Short aliases always classified as activities (watch TV, music, Shield, power off)
+_ACTIVITY_ALIASES = frozenset({'tv', 'music', 'shield', 'off'})
+
+# Audio on/off switches count as audio commands even if missing from AUDIO_COMMANDS
+_AUDIO_SWITCH_COMMANDS = frozenset({'audio-on', 'audio-off'})
+
+
+@lru_cache(maxsize=256)
+def _classify_command(command: str, action: Optional[str]) -> CommandType:
+    """
+    Cached implementation of StateManager.classify_command.
+
+    The result depends only on (command, action) and on config.py, which is
+    static for the lifetime of the process, so repeated classifications of
+    the same button are served from the cache.
+    """
+    # Import here to avoid circular imports
+    try:
+        from config import ACTIVITIES, AUDIO_COMMANDS
+    except ImportError:
+        # Fallback if config not available
+        ACTIVITIES = {}
+        AUDIO_COMMANDS = {}
+    
+    command_lower = command.lower()
+    
+    # If there's an action parameter, it's always a device command
+    # (e.g., "shield Home", "samsung PowerOn")
+    if action is not None and action.strip():
+        # Check if it's an audio device command first
+        if command_lower in AUDIO_COMMANDS:
+            return CommandType.AUDIO
+        # Special audio commands
+        elif command_lower in _AUDIO_SWITCH_COMMANDS:
+            return CommandType.AUDIO
+        else:
+            return CommandType.DEVICE
+    
+    # No action parameter - check command type
+    
+    # Activity commands (slow, blocking) - only when no action specified
+    # First check exact match in ACTIVITIES
+    if command_lower in ACTIVITIES:
+        return CommandType.ACTIVITY
+    
+    # Then check common aliases for activities
+    # (treated as activities even when config.py uses different names)
+    if command_lower in _ACTIVITY_ALIASES:
+        return CommandType.ACTIVITY
+        
+    # Audio commands (fast, non-blocking)
+    if command_lower in AUDIO_COMMANDS:
+        return CommandType.AUDIO
+        
+    # Special audio commands
+    if command_lower in _AUDIO_SWITCH_COMMANDS:
+        return CommandType.AUDIO
+        
+    # Smart commands are device commands
+    if command_lower.startswith('smart_'):
+        return CommandType.DEVICE
+        
+    # Everything else is device command
+    return CommandType.DEVICE
+
+
 class StateManager(QObject):
     """
     Centralized state manager that coordinates GUI and Worker interactions.
@@ -70,7 +148,7 @@ class StateManager(QObject):
         self.activity_start_time: float = 0.0
         
         # Command queue and processing state
-        self._command_queue: list[CommandState] = []
+        self._command_queue: Deque[CommandState] = deque()
         self._current_command: Optional[CommandState] = None
         
         # UI state tracking
@@ -98,68 +176,7 @@ class StateManager(QObject):
             
         Requirements: 3.4
         """
-        # Import here to avoid circular imports
-        try:
-            from config import ACTIVITIES, AUDIO_COMMANDS
-        except ImportError:
-            # Fallback if config not available
-            ACTIVITIES = {}
-            AUDIO_COMMANDS = {}
-        
-        command_lower = command.lower()
-        
-        # If there's an action parameter, it's always a device command
-        # (e.g., "shield Home", "samsung PowerOn")
-        if action is not None and action.strip():
-            # Check if it's an audio device command first
-            if command_lower in AUDIO_COMMANDS:
-                return CommandType.AUDIO
-            # Special audio commands
-            elif command_lower in ['audio-on', 'audio-off']:
-                return CommandType.AUDIO
-            else:
-                return CommandType.DEVICE
-        
-        # No action parameter - check command type
-        
-        # Activity commands (slow, blocking) - only when no action specified
-        # First check exact match in ACTIVITIES
-        if command_lower in ACTIVITIES:
-            return CommandType.ACTIVITY
-        
-        # Then check common aliases for activities
-        activity_aliases = {
-            'tv': ['watch_tv', 'watch tv'],
-            'music': ['listen_to_music', 'listen to music'],
-            'shield': ['nvidia_shield', 'nvidia shield', 'gaming'],
-            'off': ['poweroff', 'power_off']
-        }
-        
-        # Check if command is an alias for any activity
-        if command_lower in activity_aliases:
-            # Check if any of the full names exist in ACTIVITIES
-            for full_name in activity_aliases[command_lower]:
-                if full_name.replace(' ', '_') in ACTIVITIES or full_name.replace('_', ' ') in ACTIVITIES:
-                    return CommandType.ACTIVITY
-            # Also check if the alias itself should be treated as activity
-            # (for test compatibility and user convenience)
-            if command_lower in ['tv', 'music', 'shield', 'off']:
-                return CommandType.ACTIVITY
-            
-        # Audio commands (fast, non-blocking)
-        if command_lower in AUDIO_COMMANDS:
-            return CommandType.AUDIO
-            
-        # Special audio commands
-        if command_lower in ['audio-on', 'audio-off']:
-            return CommandType.AUDIO
-            
-        # Smart commands are device commands
-        if command_lower.startswith('smart_'):
-            return CommandType.DEVICE
-            
-        # Everything else is device command
-        return CommandType.DEVICE
+        return _classify_command(command, action)
     
     def can_accept_command(self, command: str, action: Optional[str] = None) -> bool:
         """
@@ -174,8 +191,10 @@ class StateManager(QObject):
             
         Requirements: 2.1 (activity blocking)
         """
-        command_type = self.classify_command(command, action)
-        
+        return self._can_accept_command_type(self.classify_command(command, action))
+    
+    def _can_accept_command_type(self, command_type: CommandType) -> bool:
+        """Acceptance check for an already classified command (see can_accept_command)."""
         # Activity commands are blocked if another activity is in progress or queued
         if command_type == CommandType.ACTIVITY:
             # Check if we're currently processing an activity
@@ -206,11 +225,12 @@ class StateManager(QObject):
             
         Requirements: 1.1 (sequential processing), 2.1 (activity blocking)
         """
-        if not self.can_accept_command(command, action):
-            return False
-            
+        # Classify once and reuse the result for both acceptance and queuing
         command_type = self.classify_command(command, action)
         
+        if not self._can_accept_command_type(command_type):
+            return False
+        
         # Estimate duration based on command type
         if command_type == CommandType.ACTIVITY:
             estimated_duration = 10.0  # Activities take longer
@@ -280,12 +300,14 @@ class StateManager(QObject):
         
         # Remove completed command from queue if it was queued (FIFO order)
         if self._command_queue:
-            completed_command = self._command_queue.pop(0)  # Remove from front (FIFO)
+            completed_command = self._command_queue.popleft()  # Remove from front (FIFO)
             self.pending_commands = len(self._command_queue)
             
             # Log command completion for debugging sequential processing
-            print(f"Command completed: {completed_command.command} {completed_command.action or ''} "
-                  f"(success: {success}, queue remaining: {self.pending_commands})")
+            # (lazy %-formatting: nothing is built unless DEBUG logging is enabled)
+            logger.debug("Command completed: %s %s (success: %s, queue remaining: %s)",
+                         completed_command.command, completed_command.action or '',
+                         success, self.pending_commands)
             
         self._update_processing_state()
         
@@ -357,24 +379,22 @@ class StateManager(QObject):
         """
         # Verify queue is in chronological order (oldest first)
         if len(self._command_queue) > 1:
-            for i in range(len(self._command_queue) - 1):
-                current_cmd = self._command_queue[i]
-                next_cmd = self._command_queue[i + 1]
-                
+            following = islice(self._command_queue, 1, None)
+            for i, (current_cmd, next_cmd) in enumerate(zip(self._command_queue, following)):
                 if current_cmd.timestamp > next_cmd.timestamp:
                     # Queue is not in proper order - this shouldn't happen
-                    print(f"WARNING: Command queue not in chronological order!")
-                    print(f"  Command {i}: {current_cmd.command} at {current_cmd.timestamp}")
-                    print(f"  Command {i+1}: {next_cmd.command} at {next_cmd.timestamp}")
+                    logger.warning(f"Command queue not in chronological order! "
+                                   f"Command {i}: {current_cmd.command} at {current_cmd.timestamp}, "
+                                   f"command {i+1}: {next_cmd.command} at {next_cmd.timestamp}")
                     return False
         
         # Verify current command is the oldest if processing
         if self.is_processing and self._current_command and self._command_queue:
             oldest_queued = self._command_queue[0]
             if self._current_command.timestamp > oldest_queued.timestamp:
-                print(f"WARNING: Processing newer command before older queued command!")
-                print(f"  Current: {self._current_command.command} at {self._current_command.timestamp}")
-                print(f"  Oldest queued: {oldest_queued.command} at {oldest_queued.timestamp}")
+                logger.warning(f"Processing newer command before older queued command! "
+                               f"Current: {self._current_command.command} at {self._current_command.timestamp}, "
+                               f"oldest queued: {oldest_queued.command} at {oldest_queued.timestamp}")
                 return False
         
         return True
@@ -517,7 +537,7 @@ class StateManager(QObject):
         Requirements: 1.4 (error handling)
         """
         # Log network error for debugging
-        print(f"Network error: {error_message}")
+        logger.warning(f"Network error: {error_message}")
         
         # Show user-friendly network error message
         self._show_error("Connessione persa", "network")
@@ -537,7 +557,7 @@ class StateManager(QObject):
         Requirements: 1.4 (error handling)
         """
         # Log timeout for debugging
-        print(f"Timeout error: {operation} timed out after {timeout_duration}s")
+        logger.warning(f"Timeout error: {operation} timed out after {timeout_duration}s")
         
         # Show user-friendly timeout message
         self._show_error("Operazione lenta", "timeout")
@@ -559,26 +579,25 @@ class StateManager(QObject):
         """
         # Log command error for debugging
         cmd_display = f"{command} {action or ''}".strip()
-        print(f"Command error: {cmd_display} failed with: {error_message}")
+        logger.warning(f"Command error: {cmd_display} failed with: {error_message}")
         
         # Check if this is a TV command for specialized error handling
         is_tv_command = self._is_tv_command_error(command, action, error_message)
         
         # Determine error type and user message
-        error_lower = error_message.lower()
-        if any(keyword in error_lower for keyword in ["network", "connection", "connect", "websocket"]):
+        if _NETWORK_ERROR_RE.search(error_message):
             error_type = "network"
             if is_tv_command:
                 user_message = "TV connessione persa"
             else:
                 user_message = "Connessione Hub"
-        elif any(keyword in error_lower for keyword in ["timeout", "timed out", "time out"]):
+        elif _TIMEOUT_ERROR_RE.search(error_message):
             error_type = "timeout"
             if is_tv_command:
                 user_message = "TV timeout"
             else:
                 user_message = "Timeout comando"
-        elif is_tv_command and any(keyword in error_lower for keyword in ["not configured", "not found", "validation failed"]):
+        elif is_tv_command and _TV_CONFIG_ERROR_RE.search(error_message):
             error_type = "tv_config"
             user_message = "TV non configurato"
         else: